@@ -1,65 +1,552 @@
 import sys
 import os
+import asyncio
 import subprocess
 import re
+import shlex
+import secrets
+import threading
+import queue
+import posixpath
+import collections
+import socket
+import struct
+import errno
+import mmap
+from concurrent.futures import ThreadPoolExecutor
 from PyQt6.QtWidgets import (
     QApplication, QMainWindow, QVBoxLayout, QHBoxLayout, QWidget, QTreeWidget, QTreeWidgetItem,
     QListWidget, QListWidgetItem, QPushButton, QProgressBar, QLabel, QMessageBox, QInputDialog,
     QFileDialog, QSplitter
 )
-from PyQt6.QtCore import Qt, QThread, pyqtSignal, QTimer
+from PyQt6.QtCore import Qt, QObject, QThread, QSocketNotifier, pyqtSignal, QTimer
 from PyQt6.QtGui import QIcon, QFont
 
-class TransferWorker(QThread):
+try:
+    # Optional pure-python client for the adb server; avoids spawning adb for shell commands
+    from ppadb.client import Client as _AdbClient
+except ImportError:
+    _AdbClient = None
+
+_PCT_RE = re.compile(rb'(\d+)%')
+
+# Icons are created once and shared by every row.
+# Note: To use emojis, set text with emoji, but for QIcon, need images. For simplicity, use text.
+_FOLDER_ICON = QIcon()  # Use emoji or default folder icon; for simplicity, use text
+_FILE_ICON = QIcon()  # 📄
+_IMAGE_ICON = QIcon()  # 🖼️
+_VIDEO_ICON = QIcon()  # 🎥
+_ARCHIVE_ICON = QIcon()  # 📦
+_APK_ICON = QIcon()  # 📱
+_ICON_FOR_EXT = {
+    'jpg': _IMAGE_ICON, 'png': _IMAGE_ICON, 'gif': _IMAGE_ICON,
+    'mp4': _VIDEO_ICON, 'avi': _VIDEO_ICON,
+    'zip': _ARCHIVE_ICON, 'rar': _ARCHIVE_ICON,
+    'apk': _APK_ICON,
+}
+# Non-regular entry types from `stat -c %F`; regular files fall back to the extension
+_ICON_FOR_KIND = {
+    # Strings printed by Android's toybox `stat -c %F`
+    'directory': _FOLDER_ICON,
+    'character device': _FILE_ICON, 'block device': _FILE_ICON,
+    'FIFO (named pipe)': _FILE_ICON, 'socket': _FILE_ICON,
+    'symbolic link': _FILE_ICON,  # only broken links; others are followed
+}
+_LIST_FORMAT = shlex.quote('%F\t%s\t%n')
+
+def _list_command(path):
+    """Shell command printing type, size and path of every entry in a directory.
+
+    The command fails (without leaving the shell) if the directory can't be read.
+    """
+    d = shlex.quote(path)
+    entries = f"find -H {d} -mindepth 1 -maxdepth 1 ! -name '.*'"
+    # find batches the stat calls under ARG_MAX however big the directory is.
+    # Links are followed so linked directories stay navigable; broken links
+    # fail `stat -L`, so every link is also stat'ed unfollowed and
+    # _parse_listing keeps the first line it sees for each name.
+    return (f"if [ -d {d} ] && [ -r {d} ] && [ -x {d} ]; then "
+            f"{entries} -exec stat -L -c {_LIST_FORMAT} -- {{}} + 2>/dev/null; "
+            f"{entries} -type l -exec stat -c {_LIST_FORMAT} -- {{}} + 2>/dev/null; "
+            f"true; else false; fi")
+
+def _parse_listing(listing):
+    """Return sorted (kind, size, name) tuples from _list_command output."""
+    entries = {}
+    for line in listing.splitlines():
+        kind, _, rest = line.partition('\t')
+        size, _, path = rest.partition('\t')
+        if path:
+            name = path.rpartition('/')[2]
+            if name not in entries:
+                entries[name] = (kind, int(size) if size.isdigit() else 0, name)
+    return [entries[name] for name in sorted(entries)]
+
+def _adb_server_port():
+    return int(os.environ.get('ANDROID_ADB_SERVER_PORT', 5037))
+
+def _parse_percent(line):
+    """Return the percentage from an adb -p progress line such as b'[ 12%] /sdcard/foo'."""
+    head, sep, _ = line.partition(b'%')
+    if sep:
+        digits = head.rpartition(b'[')[2].strip()
+        if digits.isdigit():
+            return int(digits)
+    match = _PCT_RE.search(line)
+    return int(match.group(1)) if match else None
+
+def _read_and_close(conn):
+    try:
+        return conn.read_all()
+    finally:
+        conn.close()
+
+class AdbShellSession:
+    """A single long-lived `adb shell` process shared by every shell command.
+
+    Each command is followed by a line holding a random per-session token and
+    the exit code, so its output and exit code can be read back without
+    spawning a new adb process. When ppadb is installed, commands go straight
+    to the adb server through it instead; its legacy `shell:` service merges
+    stderr into stdout, so commands sent that way have stderr discarded to
+    match the subprocess session.
+    """
+
+    def __init__(self, device_id, argv):
+        self.device_id = device_id
+        self.argv = argv  # [adb, '-s', device_id, 'shell']
+        self.token = f'__END_{secrets.token_hex(8)}__'
+        # The leading newline puts the token at the start of its own line even
+        # when the command's output lacks a trailing newline
+        self.trailer = f"; printf '\\n%s %d\\n' {self.token} $?"
+        self.process = None
+        self.device = None  # ppadb device, when the library is available
+        self.lock = threading.Lock()
+
+    def start(self):
+        if _AdbClient is not None:
+            try:
+                self.device = _AdbClient(port=_adb_server_port()).device(self.device_id)
+            except Exception:
+                self.device = None
+            if self.device is not None:
+                return
+        self.process = subprocess.Popen(
+            self.argv,
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, bufsize=0)
+
+    def close(self):
+        if self.process and self.process.poll() is None:
+            try:
+                self.process.stdin.close()
+            except OSError:
+                pass
+            self.process.kill()
+        self.process = None
+        self.device = None
+
+    def run(self, cmd):
+        with self.lock:
+            if self.device is None and (self.process is None or self.process.poll() is not None):
+                self.start()
+            if self.device is not None:
+                # Read raw bytes ourselves; ppadb's own strict UTF-8 decode fails on odd filenames
+                raw = []
+                self.device.shell(f"{{ {cmd}; }} 2>/dev/null" + self.trailer,
+                                  handler=lambda conn: raw.append(_read_and_close(conn)))
+                out = raw[0].decode(errors='replace')
+                head, sep, tail = out.rpartition(f'\n{self.token} ')
+                if not sep:
+                    raise RuntimeError("adb shell returned no exit status")
+                return head.replace('\r\n', '\n').rstrip('\r'), int(tail)
+            try:
+                self.process.stdin.write((cmd + self.trailer + '\n').encode())
+                marker = self.token.encode() + b' '
+                output = []
+                while True:
+                    line = self.process.stdout.readline()
+                    if not line:
+                        raise RuntimeError("adb shell session closed")
+                    if line.startswith(marker):
+                        rc = int(line[len(marker):])
+                        break
+                    output.append(line)
+            except Exception:
+                # Unread output would be mistaken for the next command's; start over
+                self.close()
+                raise
+            out = b''.join(output).decode(errors='replace').replace('\r\n', '\n')
+            return out[:-1] if out.endswith('\n') else out, rc  # Drop the newline printf added
+
+class AdbCommandWorker(QThread):
+    """Runs adb commands off the GUI thread, one at a time, on a persistent shell.
+
+    `submit` queues a shell command (str) or a host-side adb argv (list); the
+    callback is invoked on the GUI thread with (stdout, returncode), where a
+    returncode of -1 means the command could not be run and stdout holds the error.
+    Host-side commands report stderr merged into stdout.
+    """
+    result = pyqtSignal(int, str, int)  # callback_id, stdout, returncode
+
+    def __init__(self, adb_path):
+        super().__init__()
+        self.adb_path = adb_path
+        self.device_id = None
+        self.shell_prefix = None
+        self.session = None
+        self.session_lock = threading.Lock()
+        self.queue = queue.Queue()
+        self.callbacks = {}
+        self.next_id = 0
+        self.result.connect(self.dispatch)
+
+    def submit(self, cmd, callback=None):
+        self.next_id += 1
+        self.callbacks[self.next_id] = callback
+        self.queue.put((cmd, self.next_id))
+
+    def stop(self, timeout=2000):
+        self.queue.put(None)
+        # Killing the shell unblocks a command stuck on an unresponsive device
+        with self.session_lock:
+            session = self.session
+        if session:
+            session.close()
+        if not self.wait(timeout):
+            self.terminate()
+            self.wait()
+
+    def set_device(self, device_id, shell_prefix):
+        with self.session_lock:
+            self.device_id = device_id
+            self.shell_prefix = shell_prefix
+
+    def shell(self):
+        """Return the shell session for the current device, restarting it on device change."""
+        with self.session_lock:
+            if self.session is None or self.session.device_id != self.device_id:
+                if self.session:
+                    self.session.close()
+                self.session = AdbShellSession(self.device_id, self.shell_prefix)
+            return self.session
+
+    def run(self):
+        while True:
+            job = self.queue.get()
+            if job is None:
+                break
+            cmd, callback_id = job
+            try:
+                if isinstance(cmd, list):
+                    result = subprocess.run([self.adb_path, *cmd], stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True)
+                    out, rc = result.stdout, result.returncode
+                else:
+                    out, rc = self.shell().run(cmd)
+            except Exception as e:
+                out, rc = str(e), -1
+            self.result.emit(callback_id, out, rc)
+        if self.session:
+            self.session.close()
+
+    def dispatch(self, callback_id, out, rc):
+        callback = self.callbacks.pop(callback_id, None)
+        if callback:
+            callback(out, rc)
+
+class AdbShellPool(QObject):
+    """Runs independent shell commands concurrently over several persistent shells.
+
+    `submit_many` fans the commands out across the sessions and calls back once
+    on the GUI thread with a list of (stdout, returncode) in command order.
+    """
+    done = pyqtSignal(int, object)  # batch_id, results
+
+    def __init__(self, size=4):
+        super().__init__()
+        self.size = size
+        self.executor = ThreadPoolExecutor(max_workers=size)
+        self.sessions = queue.Queue()  # idle sessions; at most one per executor thread
+        self.device_id = None
+        self.shell_prefix = None
+        self.callbacks = {}
+        self.next_id = 0
+        self.done.connect(self.dispatch)
+
+    def set_device(self, device_id, shell_prefix):
+        # Sessions for the old device are replaced as they come back into use
+        self.device_id = device_id
+        self.shell_prefix = shell_prefix
+
+    def _run(self, cmd):
+        try:
+            session = self.sessions.get_nowait()
+        except queue.Empty:
+            session = None
+        if session is None or session.device_id != self.device_id:
+            if session:
+                session.close()
+            session = AdbShellSession(self.device_id, self.shell_prefix)
+        try:
+            return session.run(cmd)
+        except Exception as e:
+            return str(e), -1
+        finally:
+            self.sessions.put(session)
+
+    def submit_many(self, cmds, callback):
+        self.next_id += 1
+        batch_id = self.next_id
+        self.callbacks[batch_id] = callback
+        if not cmds:
+            self.done.emit(batch_id, [])
+            return
+        futures = [self.executor.submit(self._run, cmd) for cmd in cmds]
+        remaining = [len(futures)]
+        lock = threading.Lock()
+
+        def on_done(_):
+            with lock:
+                remaining[0] -= 1
+                if remaining[0]:
+                    return
+            self.done.emit(batch_id, [f.result() for f in futures])
+        for future in futures:
+            future.add_done_callback(on_done)
+
+    def dispatch(self, batch_id, results):
+        callback = self.callbacks.pop(batch_id, None)
+        if callback:
+            callback(results)
+
+    def close(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
+        while not self.sessions.empty():
+            self.sessions.get_nowait().close()
+
+def _pjoin(a, b):
+    """Join device (POSIX) paths without os.path's host-specific separator handling."""
+    return a + b if a.endswith('/') else a + '/' + b
+
+def _split(items, n):
+    """Split items into at most n non-empty interleaved chunks."""
+    return [chunk for chunk in (items[i::n] for i in range(n)) if chunk]
+
+class AdbServerConnection:
+    """A socket to the local adb server speaking its length-prefixed host protocol."""
+
+    def __init__(self, host='127.0.0.1', port=None):
+        self.host = host
+        self.port = port or _adb_server_port()
+        self.sock = None
+
+    def __enter__(self):
+        self.connect()
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def connect(self):
+        self.sock = socket.create_connection((self.host, self.port))
+
+    def close(self):
+        if self.sock:
+            self.sock.close()
+            self.sock = None
+
+    def _recv_exactly(self, n):
+        data = bytearray()
+        while len(data) < n:
+            chunk = self.sock.recv(n - len(data))
+            if not chunk:
+                raise ConnectionError("adb server closed the connection")
+            data += chunk
+        return bytes(data)
+
+    def request(self, service):
+        service = service.encode()
+        self.sock.sendall(b'%04x' % len(service) + service)
+        status = self._recv_exactly(4)
+        if status == b'FAIL':
+            length = int(self._recv_exactly(4), 16)
+            raise RuntimeError(self._recv_exactly(length).decode(errors='replace'))
+        if status != b'OKAY':
+            raise RuntimeError(f"Unexpected adb server reply: {status!r}")
+
+class AdbSyncClient(AdbServerConnection):
+    """Minimal client for the adb server's sync protocol (the one adb push/pull speak)."""
+    STA2 = struct.Struct('<4sIQQIIIIQqqq')  # id, error, dev, ino, mode, nlink, uid, gid, size, atime, mtime, ctime
+    DATA_MAX = 64 * 1024  # largest payload adb accepts in one DATA frame
+
+    def __init__(self, device_id, host='127.0.0.1', port=None):
+        super().__init__(host, port)
+        self.device_id = device_id
+
+    def connect(self):
+        super().connect()
+        self.request(f'host:transport:{self.device_id}')
+        self.request('sync:')
+
+    def close(self):
+        if self.sock:
+            try:
+                self.sock.sendall(b'QUIT' + struct.pack('<I', 0))
+            except OSError:
+                pass
+        super().close()
+
+    def stat(self, path):
+        """Return (mode, size) for a device path from a single STA2 packet.
+
+        Devices without the stat_v2 feature reject STA2 and drop the connection,
+        so the v1 STAT request is retried on a fresh one (sizes wrap at 4 GiB).
+        """
+        path = path.encode()
+        self.sock.sendall(b'STA2' + struct.pack('<I', len(path)) + path)
+        head = self._recv_exactly(8)
+        if head[:4] == b'FAIL':
+            self.close()
+            self.connect()
+            return self._stat_v1(path)
+        reply = self.STA2.unpack(head + self._recv_exactly(self.STA2.size - len(head)))
+        if reply[0] != b'STA2':
+            raise RuntimeError(f"Unexpected sync reply: {reply[0]!r}")
+        if reply[1]:
+            raise OSError(reply[1], os.strerror(reply[1]), path.decode())
+        return reply[4], reply[8]
+
+    def _stat_v1(self, path):
+        self.sock.sendall(b'STAT' + struct.pack('<I', len(path)) + path)
+        reply, mode, size, _ = struct.unpack('<4sIII', self._recv_exactly(16))
+        if reply != b'STAT':
+            raise RuntimeError(f"Unexpected sync reply: {reply!r}")
+        if not mode:
+            # STAT reports a missing path as all zeroes
+            raise OSError(errno.ENOENT, os.strerror(errno.ENOENT), path.decode())
+        return mode, size
+
+    def push(self, src, dst, progress=None):
+        """Send a local file with SEND/DATA/DONE frames, calling progress(sent, total) per frame.
+
+        Frames are fed straight from the page cache with os.sendfile where the OS
+        supports it, otherwise from slices of an mmap of the source, so no
+        intermediate read buffers are allocated whatever the file size.
+        """
+        st = os.stat(src)
+        header = f'{dst},{st.st_mode}'.encode()
+        self.sock.sendall(b'SEND' + struct.pack('<I', len(header)) + header)
+        with open(src, 'rb') as f:
+            if st.st_size:
+                if hasattr(os, 'sendfile'):
+                    self._send_frames(st.st_size, progress, lambda offset, n: self._sendfile(f, offset, n))
+                else:
+                    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm, memoryview(mm) as view:
+                        self._send_frames(st.st_size, progress, lambda offset, n: self.sock.sendall(view[offset:offset + n]))
+        self.sock.sendall(b'DONE' + struct.pack('<I', int(st.st_mtime)))
+        status, length = struct.unpack('<4sI', self._recv_exactly(8))
+        if status == b'FAIL':
+            raise RuntimeError(self._recv_exactly(length).decode(errors='replace'))
+        if status != b'OKAY':
+            raise RuntimeError(f"Unexpected sync reply: {status!r}")
+
+    def _send_frames(self, size, progress, send):
+        for offset in range(0, size, self.DATA_MAX):
+            n = min(self.DATA_MAX, size - offset)
+            self.sock.sendall(b'DATA' + struct.pack('<I', n))
+            send(offset, n)
+            if progress:
+                progress(offset + n, size)
+
+    def _sendfile(self, f, offset, n):
+        sent = 0
+        while sent < n:
+            sent += os.sendfile(self.sock.fileno(), f.fileno(), offset + sent, n - sent)
+
+_transfer_loop = None
+_transfer_loop_lock = threading.Lock()
+
+def _get_transfer_loop():
+    """Return the event loop shared by all transfers, starting its thread on first use."""
+    global _transfer_loop
+    with _transfer_loop_lock:
+        if _transfer_loop is None:
+            _transfer_loop = asyncio.new_event_loop()
+            threading.Thread(target=_transfer_loop.run_forever, daemon=True).start()
+        return _transfer_loop
+
+class TransferWorker(QObject):
+    """A push or pull running as a coroutine on the shared transfer event loop."""
+    SYNC_PUSH_THRESHOLD = 64 << 20  # pushes at least this big use AdbSyncClient.push
     progress = pyqtSignal(int, str)  # progress_percent, status_text
     finished = pyqtSignal(bool, str)  # success, message
 
-    def __init__(self, adb_path, device_id, operation, src, dst):
+    def __init__(self, device_id, adb_prefix, operation, src, dst, size=None):
         super().__init__()
-        self.adb_path = adb_path
         self.device_id = device_id
+        self.adb_prefix = adb_prefix  # [adb, '-s', device_id, 'push' or 'pull', '-p']
         self.operation = operation  # 'push' or 'pull'
         self.src = src
         self.dst = dst
-        self.total_size = 0
+        self.total_size = size or 0
+        self.size_known = size is not None
+        self.last_percent = -1
+        self.future = None
 
-    def run(self):
+    def start(self):
+        self.future = asyncio.run_coroutine_threadsafe(self._run_transfer(), _get_transfer_loop())
+
+    def remote_size(self):
+        # Ask the adb server directly instead of spawning a shell for `stat`
+        with AdbSyncClient(self.device_id) as sync:
+            return sync.stat(self.src)[1]
+
+    def sync_push(self):
+        # Large pushes skip adb.exe and stream the file over the sync protocol
+        with AdbSyncClient(self.device_id) as sync:
+            sync.push(self.src, self.dst, lambda sent, total: self.report_progress(sent * 100 // total))
+
+    def report_progress(self, percent):
+        if percent != self.last_percent:
+            self.last_percent = percent
+            transferred = self.total_size * percent // 100
+            self.progress.emit(percent, f"{transferred / 1048576:.2f} MB / {self.total_size / 1048576:.2f} MB")
+
+    async def _run_transfer(self):
         try:
             # Determine total size
             if self.operation == 'push':
                 self.total_size = os.path.getsize(self.src)
-            elif self.operation == 'pull':
-                cmd = [self.adb_path, '-s', self.device_id, 'shell', 'stat', '-c%s', self.src]
-                result = subprocess.run(cmd, capture_output=True, text=True)
-                if result.returncode == 0:
-                    self.total_size = int(result.stdout.strip())
-                else:
-                    self.finished.emit(False, f"Failed to get file size: {result.stderr}")
+                if self.total_size >= self.SYNC_PUSH_THRESHOLD:
+                    await asyncio.get_running_loop().run_in_executor(None, self.sync_push)
+                    self.finished.emit(True, "Transfer completed successfully.")
                     return
+            elif self.operation == 'pull' and not self.size_known:
+                loop = asyncio.get_running_loop()
+                try:
+                    self.total_size = await loop.run_in_executor(None, self.remote_size)
+                except Exception:
+                    # The size only feeds the progress label; adb pull reports real errors
+                    self.total_size = 0
 
             # Execute transfer with -p
-            cmd = [self.adb_path, '-s', self.device_id, self.operation, '-p', self.src, self.dst]
-            process = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True, bufsize=1, universal_newlines=True)
-
-            transferred = 0
-            for line in iter(process.stdout.readline, ''):
-                line = line.strip()
-                # Parse progress: adb push/pull -p outputs lines like "  50%  512MB/s  10s" or similar
-                # Actually, it outputs progress in a format like "  1234 / 5678" or percentage.
-                # For simplicity, assume it outputs percentage and transferred size.
-                # In reality, adb push/pull -p outputs to stderr, but let's capture stdout.
-                # This is a simplification; real parsing might need adjustment.
-                match = re.search(r'(\d+)%', line)
-                if match:
-                    percent = int(match.group(1))
-                    # Estimate transferred based on percent, but better to parse actual bytes if possible.
-                    # For now, use percent for progress bar.
-                    transferred_mb = (percent / 100) * (self.total_size / (1024*1024))
-                    total_mb = self.total_size / (1024*1024)
-                    status = f"{transferred_mb:.2f} MB / {total_mb:.2f} MB"
-                    self.progress.emit(percent, status)
-
-            process.wait()
+            cmd = self.adb_prefix + [self.src, self.dst]
+            process = await asyncio.create_subprocess_exec(*cmd, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.STDOUT)
+
+            pending = bytearray()
+            while chunk := await process.stdout.read(4096):
+                pending += chunk
+                # Only the newest complete token matters; keep the unterminated tail
+                end = max(pending.rfind(b'\r'), pending.rfind(b'\n'))
+                if end < 0:
+                    continue
+                complete = pending[:end].rstrip(b'\r\n')
+                del pending[:end + 1]
+                start = max(complete.rfind(b'\r'), complete.rfind(b'\n')) + 1
+                percent = _parse_percent(bytes(complete[start:]))
+                if percent is not None:
+                    self.report_progress(percent)
+
+            await process.wait()
             if process.returncode == 0:
                 self.finished.emit(True, "Transfer completed successfully.")
             else:
@@ -68,15 +555,31 @@ class TransferWorker(QThread):
             self.finished.emit(False, str(e))
 
 class AdbFileExplorer(QMainWindow):
+    LS_CACHE_SIZE = 128
+    SHELL_POOL_SIZE = 4
+    TREE_PREFETCH_LIMIT = 32
+
     def __init__(self):
         super().__init__()
         self.adb_path = self.get_adb_path()
         self.device_id = None
+        self._adb_prefix = None
+        self._adb_shell_prefix = None
+        self._adb_push_prefix = None
+        self._adb_pull_prefix = None
+        self._ls_cache = collections.OrderedDict()  # path -> _list_command output, least recently used first
+        self._tree_populated = set()  # tree paths whose children have been loaded
+        self._tree_items = {}  # path -> QTreeWidgetItem currently in the tree
         self.current_path = '/sdcard'
-        self.transfer_worker = None
+        self._transfers = set()  # running TransferWorkers, kept alive until they finish
+        self.device_tracker = None
+        self.device_notifier = None
+        self.device_buffer = b''
+        self.adb_worker = AdbCommandWorker(self.adb_path)
+        self.adb_worker.start()
+        self.adb_pool = AdbShellPool(self.SHELL_POOL_SIZE)
         self.init_ui()
-        self.check_device()
-        self.refresh_file_list()
+        self.start_device_tracking()
 
     def get_adb_path(self):
         if hasattr(sys, '_MEIPASS'):
@@ -115,7 +618,9 @@ class AdbFileExplorer(QMainWindow):
         self.tree_widget = QTreeWidget()
         self.tree_widget.setHeaderLabel("Directories")
         self.tree_widget.itemDoubleClicked.connect(self.on_tree_double_click)
+        self.tree_widget.itemExpanded.connect(self.on_tree_expanded)
         splitter.addWidget(self.tree_widget)
+        self.reset_tree()
 
         # File list
         self.file_list = QListWidget()
@@ -154,119 +659,287 @@ class AdbFileExplorer(QMainWindow):
         self.progress_label = QLabel("Ready")
         layout.addWidget(self.progress_label)
 
-        # Timer to refresh device status
-        self.timer = QTimer()
-        self.timer.timeout.connect(self.check_device)
-        self.timer.start(5000)  # Check every 5 seconds
+        # Coalesce bursts of refresh requests (e.g. one per finished transfer) into one listing
+        self._refresh_timer = QTimer(self, singleShot=True, interval=150)
+        self._refresh_timer.timeout.connect(self._refresh_now)
 
-    def check_device(self):
+    def start_device_tracking(self):
         if not os.path.exists(self.adb_path):
             self.status_label.setText("ADB not found")
+            QTimer.singleShot(5000, self.start_device_tracking)
+            return
+        # Make sure the adb server is up, then subscribe to its device list
+        self.adb_worker.submit(['start-server'], self.on_server_started)
+
+    def on_server_started(self, out, rc):
+        if rc != 0:
+            self.status_label.setText(f"Error starting adb server: {out.strip() or rc}")
+            QTimer.singleShot(5000, self.start_device_tracking)
             return
         try:
-            result = subprocess.run([self.adb_path, 'devices'], capture_output=True, text=True)
-            lines = result.stdout.strip().split('\n')[1:]  # Skip "List of devices attached"
-            devices = [line.split('\t')[0] for line in lines if line.strip() and 'device' in line]
-            if devices:
-                self.device_id = devices[0]  # Take the first device
-                self.status_label.setText(f"Device: {self.device_id}")
-            else:
-                self.device_id = None
-                self.status_label.setText("Device: Not connected")
+            tracker = AdbServerConnection()
+            tracker.connect()
+            tracker.request('host:track-devices')
+            tracker.sock.setblocking(False)
         except Exception as e:
             self.status_label.setText(f"Error checking device: {str(e)}")
+            QTimer.singleShot(5000, self.start_device_tracking)
+            return
+        self.device_tracker = tracker
+        self.device_buffer = b''
+        # The server pushes a new device list only when something changes
+        self.device_notifier = QSocketNotifier(tracker.sock.fileno(), QSocketNotifier.Type.Read, self)
+        self.device_notifier.activated.connect(self.check_device)
+
+    def stop_device_tracking(self):
+        if self.device_notifier:
+            self.device_notifier.setEnabled(False)
+            self.device_notifier = None
+        if self.device_tracker:
+            self.device_tracker.close()
+            self.device_tracker = None
+
+    def check_device(self):
+        try:
+            data = self.device_tracker.sock.recv(4096)
+        except BlockingIOError:
+            return
+        except OSError:
+            data = b''
+        if not data:
+            # The adb server went away; forget the device and reconnect later
+            self.stop_device_tracking()
+            self.on_devices_listed('')
+            self.status_label.setText("ADB server disconnected")
+            QTimer.singleShot(5000, self.start_device_tracking)
+            return
+        self.device_buffer += data
+        # Each message is a 4-hex-digit length followed by the device list
+        while len(self.device_buffer) >= 4:
+            length = int(self.device_buffer[:4], 16)
+            if len(self.device_buffer) < 4 + length:
+                break
+            payload = self.device_buffer[4:4 + length].decode(errors='replace')
+            self.device_buffer = self.device_buffer[4 + length:]
+            self.on_devices_listed(payload)
 
-    def refresh_file_list(self):
+    def on_devices_listed(self, out):
+        devices = [line.split('\t')[0] for line in out.splitlines() if line.endswith('\tdevice')]
+        device_id = devices[0] if devices else None  # Take the first device
+        changed = device_id != self.device_id
+        if changed:
+            self._ls_cache.clear()
+            self.device_id = device_id
+            # Build the per-device argv prefixes once rather than on every call
+            if device_id:
+                self._adb_prefix = [self.adb_path, '-s', device_id]
+                self._adb_shell_prefix = self._adb_prefix + ['shell']
+                self._adb_push_prefix = self._adb_prefix + ['push', '-p']
+                self._adb_pull_prefix = self._adb_prefix + ['pull', '-p']
+            else:
+                self._adb_prefix = self._adb_shell_prefix = self._adb_push_prefix = self._adb_pull_prefix = None
+            # The worker restarts its persistent shell for the new device
+            self.adb_worker.set_device(device_id, self._adb_shell_prefix)
+            self.adb_pool.set_device(device_id, self._adb_shell_prefix)
+            self.reset_tree()
+        if self.device_id:
+            self.status_label.setText(f"Device: {self.device_id}")
+            if changed:
+                self._refresh_now()
+        else:
+            self.status_label.setText("Device: Not connected")
+
+    def _refresh_now(self):
         if not self.device_id:
             return
-        self.file_list.clear()
-        self.tree_widget.clear()
+        # Show a cached listing straight away, then refresh it from the device
+        path = self.current_path
+        cached = self._ls_cache.get(path)
+        if cached is not None:
+            self._ls_cache.move_to_end(path)
+            self.show_listing(cached)
+        self.adb_worker.submit(_list_command(path), lambda out, rc: self.on_file_list(path, out, cached, rc))
+
+    def cache_listing(self, path, listing):
+        self._ls_cache[path] = listing
+        self._ls_cache.move_to_end(path)
+        if len(self._ls_cache) > self.LS_CACHE_SIZE:
+            self._ls_cache.popitem(last=False)
+
+    def invalidate_listing(self, *paths):
+        for path in paths:
+            self._ls_cache.pop(path, None)
+
+    def on_file_list(self, path, out, cached, rc):
+        if rc == 0:
+            previous = self._ls_cache.get(path)
+            self.cache_listing(path, out)
+            if path in self._tree_populated and out != previous:
+                # Keep an already expanded tree node in step with the directory
+                self.populate_tree_item(self._tree_items[path], out)
+        if path != self.current_path:
+            return  # A newer navigation superseded this listing
+        if rc == -1:
+            QMessageBox.warning(self, "Error", f"Failed to list files: {out}")
+            return
+        if rc != 0:
+            self.invalidate_listing(path)
+            self.show_listing('')
+            QMessageBox.warning(self, "Error", f"Cannot read {path}")
+            return
+        if out != cached:
+            self.show_listing(out)
+
+    def show_listing(self, listing):
+        # Suspend repaints and sorting so the widgets lay out once per listing
+        self.file_list.setUpdatesEnabled(False)
+        self.file_list.setSortingEnabled(False)
+        self.file_list.blockSignals(True)
+        try:
+            self.file_list.clear()
 
-        # Populate tree root
+            # List files in current path; hot-loop lookups are bound to locals
+            add = self.file_list.addItem
+            mk = QListWidgetItem
+            role = Qt.ItemDataRole.UserRole
+            get_icon = self.get_icon
+            for kind, size, name in _parse_listing(listing):
+                list_item = mk(get_icon(name, kind), name)
+                list_item.setData(role, (kind == 'directory', size, name))
+                add(list_item)
+        finally:
+            self.file_list.blockSignals(False)
+            self.file_list.setUpdatesEnabled(True)
+
+    def reset_tree(self):
+        self.tree_widget.clear()
+        self._tree_populated.clear()
         root_item = QTreeWidgetItem(self.tree_widget, ['/sdcard'])
         root_item.setData(0, Qt.ItemDataRole.UserRole, '/sdcard')
-        self.populate_tree_item(root_item)
+        root_item.addChild(QTreeWidgetItem(['Loading…']))
+        self._tree_items = {'/sdcard': root_item}
 
-        # List files in current path
-        cmd = [self.adb_path, '-s', self.device_id, 'shell', 'ls', '-p', self.current_path]
-        try:
-            result = subprocess.run(cmd, capture_output=True, text=True)
-            if result.returncode == 0:
-                items = result.stdout.strip().split('\n')
-                for item in items:
-                    if item:
-                        is_dir = item.endswith('/')
-                        name = item.rstrip('/')
-                        list_item = QListWidgetItem()
-                        icon = self.get_icon(name, is_dir)
-                        list_item.setIcon(icon)
-                        list_item.setText(name)
-                        list_item.setData(Qt.ItemDataRole.UserRole, is_dir)
-                        self.file_list.addItem(list_item)
-        except Exception as e:
-            QMessageBox.warning(self, "Error", f"Failed to list files: {str(e)}")
+    def reset_tree_node(self, path):
+        """Re-list a node whose directory changed, or make it re-list on next expansion."""
+        self._tree_populated.discard(path)
+        item = self._tree_items.get(path)
+        if item is None:
+            return
+        if item.isExpanded():
+            self.on_tree_expanded(item)
+        else:
+            self.forget_tree_children(path)
+            item.takeChildren()
+            item.addChild(QTreeWidgetItem(['Loading…']))
 
-    def populate_tree_item(self, item):
+    def forget_tree_children(self, path):
+        # The node's child items are about to be removed from the tree
+        prefix = path + '/'
+        for stale in [p for p in self._tree_items if p.startswith(prefix)]:
+            del self._tree_items[stale]
+            self._tree_populated.discard(stale)
+
+    def on_tree_expanded(self, item):
+        # Children are only listed the first time a node is expanded
         path = item.data(0, Qt.ItemDataRole.UserRole)
-        cmd = [self.adb_path, '-s', self.device_id, 'shell', 'ls', '-p', path]
-        try:
-            result = subprocess.run(cmd, capture_output=True, text=True)
-            if result.returncode == 0:
-                items = result.stdout.strip().split('\n')
-                for sub_item in items:
-                    if sub_item and sub_item.endswith('/'):
-                        name = sub_item.rstrip('/')
-                        child = QTreeWidgetItem(item, [name])
-                        child.setData(0, Qt.ItemDataRole.UserRole, os.path.join(path, name).replace('\\', '/'))
-        except:
-            pass
+        if path is None or path in self._tree_populated or not self.device_id:
+            return
+        self._tree_populated.add(path)
+        cached = self._ls_cache.get(path)
+        if cached is not None:
+            self.populate_tree_item(item, cached)
+            return
+        self.adb_worker.submit(_list_command(path),
+                               lambda out, rc: self.on_tree_listing(item, path, out, rc))
+
+    def on_tree_listing(self, item, path, out, rc):
+        if self._tree_items.get(path) is not item:
+            return  # The tree was rebuilt and this item no longer exists
+        if rc != 0:
+            self._tree_populated.discard(path)
+            self.forget_tree_children(path)
+            item.takeChildren()
+            return
+        self.cache_listing(path, out)
+        self.populate_tree_item(item, out)
+
+    def populate_tree_item(self, item, listing):
+        role = Qt.ItemDataRole.UserRole
+        path = item.data(0, role)
+        children = []
+        append = children.append
+        mk = QTreeWidgetItem
+        for kind, _, name in _parse_listing(listing):
+            if kind == 'directory':
+                child = mk([name])
+                child.setData(0, role, _pjoin(path, name))
+                child.addChild(mk(['Loading…']))
+                append(child)
+        self.forget_tree_children(path)
+        self._tree_items.update((child.data(0, role), child) for child in children)
+        self.tree_widget.setUpdatesEnabled(False)
+        item.takeChildren()  # Drop the loading placeholder or the previous children
+        item.addChildren(children)
+        self.tree_widget.setUpdatesEnabled(True)
+        self.prefetch_listings([child.data(0, Qt.ItemDataRole.UserRole) for child in children])
+
+    def prefetch_listings(self, paths):
+        # List likely next expansions in parallel so they come straight from the cache
+        paths = [p for p in paths if p not in self._ls_cache][:self.TREE_PREFETCH_LIMIT]
+        if not paths:
+            return
+        device_id = self.device_id
+
+        def on_prefetched(results):
+            if device_id != self.device_id:
+                return
+            for path, (out, rc) in zip(paths, results):
+                if rc == 0 and path not in self._ls_cache:
+                    self.cache_listing(path, out)
+        self.adb_pool.submit_many([_list_command(p) for p in paths], on_prefetched)
 
     def on_tree_double_click(self, item, column):
         path = item.data(0, Qt.ItemDataRole.UserRole)
+        if path is None:
+            return
         self.current_path = path
-        self.refresh_file_list()
+        self._refresh_now()
 
     def on_file_double_click(self, item):
         name = item.text()
-        is_dir = item.data(Qt.ItemDataRole.UserRole)
+        is_dir = item.data(Qt.ItemDataRole.UserRole)[0]
         if is_dir:
-            self.current_path = os.path.join(self.current_path, name).replace('\\', '/')
-            self.refresh_file_list()
+            self.current_path = _pjoin(self.current_path, name)
+            self._refresh_now()
 
     def go_up(self):
         if self.current_path != '/sdcard':
-            self.current_path = os.path.dirname(self.current_path)
-            self.refresh_file_list()
+            self.current_path = posixpath.dirname(self.current_path)
+            self._refresh_now()
 
-    def get_icon(self, name, is_dir):
-        if is_dir:
-            return QIcon()  # Use emoji or default folder icon; for simplicity, use text
-        ext = os.path.splitext(name)[1].lower()
-        if ext in ['.jpg', '.png', '.gif']:
-            return QIcon()  # 🖼️
-        elif ext in ['.mp4', '.avi']:
-            return QIcon()  # 🎥
-        elif ext in ['.zip', '.rar']:
-            return QIcon()  # 📦
-        elif ext == '.apk':
-            return QIcon()  # 📱
-        else:
-            return QIcon()  # 📄
-        # Note: To use emojis, set text with emoji, but for QIcon, need images. For simplicity, use text.
+    def get_icon(self, name, kind):
+        icon = _ICON_FOR_KIND.get(kind)
+        if icon is not None:
+            return icon
+        base, dot, ext = name.rpartition('.')
+        return _ICON_FOR_EXT.get(ext.lower(), _FILE_ICON) if dot and base else _FILE_ICON
 
     def create_folder(self):
         name, ok = QInputDialog.getText(self, "Create Folder", "Folder name:")
         if ok and name:
-            path = os.path.join(self.current_path, name).replace('\\', '/')
-            cmd = [self.adb_path, '-s', self.device_id, 'shell', 'mkdir', '-p', path]
-            try:
-                result = subprocess.run(cmd)
-                if result.returncode == 0:
-                    self.refresh_file_list()
-                else:
-                    QMessageBox.warning(self, "Error", "Failed to create folder")
-            except Exception as e:
-                QMessageBox.warning(self, "Error", str(e))
+            path = _pjoin(self.current_path, name)
+            self.invalidate_listing(self.current_path)
+            parent = self.current_path
+            self.adb_worker.submit(f"mkdir -p {shlex.quote(path)}", lambda out, rc: self.on_folder_created(parent, out, rc))
+
+    def on_folder_created(self, parent, out, rc):
+        if rc == 0:
+            self.reset_tree_node(parent)
+            self._refresh_timer.start()
+        elif rc == -1:
+            QMessageBox.warning(self, "Error", out)
+        else:
+            QMessageBox.warning(self, "Error", "Failed to create folder")
 
     def delete_items(self):
         selected = self.file_list.selectedItems()
@@ -274,37 +947,68 @@ class AdbFileExplorer(QMainWindow):
             return
         reply = QMessageBox.question(self, "Confirm Delete", "Delete selected items recursively?", QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No)
         if reply == QMessageBox.StandardButton.Yes:
-            for item in selected:
-                name = item.text()
-                path = os.path.join(self.current_path, name).replace('\\', '/')
-                cmd = [self.adb_path, '-s', self.device_id, 'shell', 'rm', '-rf', path]
-                try:
-                    subprocess.run(cmd)
-                except Exception as e:
-                    QMessageBox.warning(self, "Error", f"Failed to delete {name}: {str(e)}")
-            self.refresh_file_list()
+            paths = [_pjoin(self.current_path, item.text()) for item in selected]
+            self.invalidate_listing(self.current_path, *paths)
+            # One rm invocation per pooled shell, run concurrently
+            cmds = ["rm -rf -- " + ' '.join(shlex.quote(p) for p in chunk) for chunk in _split(paths, self.SHELL_POOL_SIZE)]
+            parent = self.current_path
+            self.adb_pool.submit_many(cmds, lambda results: self.on_items_deleted(parent, results))
+
+    def on_items_deleted(self, parent, results):
+        self.reset_tree_node(parent)
+        errors = [out for out, rc in results if rc == -1]
+        if errors:
+            QMessageBox.warning(self, "Error", f"Failed to delete: {errors[0]}")
+        elif any(rc != 0 for _, rc in results):
+            QMessageBox.warning(self, "Error", "Failed to delete some items")
+        self._refresh_timer.start()
 
     def push_files(self):
-        if self.transfer_worker and self.transfer_worker.isRunning():
+        if self._transfers:
             return
         files, _ = QFileDialog.getOpenFileNames(self, "Select files to push")
         if not files:
             return
         dst = self.current_path
-        for src in files:
+        dst_paths = [_pjoin(dst, os.path.basename(src)) for src in files]
+        # One stat round-trip tells us which destinations already exist
+        self.adb_stat_many(dst_paths, lambda sizes: self.on_push_statted(files, dst_paths, sizes))
+
+    def on_push_statted(self, files, dst_paths, sizes):
+        if sizes is None:
+            QMessageBox.warning(self, "Error", "Failed to check existing files")
+            return
+        for src, dst_path in zip(files, dst_paths):
             # Check overwrite
             basename = os.path.basename(src)
-            dst_path = os.path.join(dst, basename).replace('\\', '/')
-            cmd = [self.adb_path, '-s', self.device_id, 'shell', 'test', '-e', dst_path]
-            result = subprocess.run(cmd)
-            if result.returncode == 0:
+            if sizes[dst_path] is not None:
                 reply = QMessageBox.question(self, "Overwrite", f"File {basename} exists. Overwrite?", QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No)
                 if reply == QMessageBox.StandardButton.No:
                     continue
             self.start_transfer('push', src, dst_path)
 
+    def adb_stat_many(self, paths, callback):
+        """Stat every path in one concurrent round-trip and call back with {path: size or None}.
+
+        The callback receives None if the command could not be run at all.
+        """
+        def on_stat(results):
+            if any(rc == -1 for _, rc in results):
+                callback(None)
+                return
+            sizes = dict.fromkeys(paths)
+            for out, _ in results:
+                for line in out.splitlines():
+                    name, sep, size = line.rpartition('\t')
+                    if sep and name in sizes and size.isdigit():
+                        sizes[name] = int(size)
+            callback(sizes)
+        fmt = shlex.quote('%n\t%s')
+        cmds = [f"stat -c {fmt} -- " + ' '.join(shlex.quote(p) for p in chunk) for chunk in _split(paths, self.SHELL_POOL_SIZE)]
+        self.adb_pool.submit_many(cmds, on_stat)
+
     def pull_files(self):
-        if self.transfer_worker and self.transfer_worker.isRunning():
+        if self._transfers:
             return
         selected = self.file_list.selectedItems()
         if not selected:
@@ -312,38 +1016,58 @@ class AdbFileExplorer(QMainWindow):
         dst_dir = QFileDialog.getExistingDirectory(self, "Select destination directory")
         if not dst_dir:
             return
-        for item in selected:
-            name = item.text()
-            src = os.path.join(self.current_path, name).replace('\\', '/')
+        srcs = [_pjoin(self.current_path, item.text()) for item in selected]
+        self.adb_stat_many(srcs, lambda sizes: self.on_pull_statted(srcs, dst_dir, sizes))
+
+    def on_pull_statted(self, srcs, dst_dir, sizes):
+        if sizes is None:
+            QMessageBox.warning(self, "Error", "Failed to read file sizes")
+            return
+        for src in srcs:
+            name = posixpath.basename(src)
             dst = os.path.join(dst_dir, name)
             # Check overwrite
             if os.path.exists(dst):
                 reply = QMessageBox.question(self, "Overwrite", f"File {name} exists. Overwrite?", QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No)
                 if reply == QMessageBox.StandardButton.No:
                     continue
-            self.start_transfer('pull', src, dst)
+            self.start_transfer('pull', src, dst, sizes[src])
 
-    def start_transfer(self, operation, src, dst):
+    def start_transfer(self, operation, src, dst, size=None):
         self.push_button.setEnabled(False)
         self.pull_button.setEnabled(False)
         self.progress_bar.setValue(0)
         self.progress_label.setText("Starting transfer...")
-        self.transfer_worker = TransferWorker(self.adb_path, self.device_id, operation, src, dst)
-        self.transfer_worker.progress.connect(self.update_progress)
-        self.transfer_worker.finished.connect(self.on_transfer_finished)
-        self.transfer_worker.start()
+        prefix = self._adb_push_prefix if operation == 'push' else self._adb_pull_prefix
+        worker = TransferWorker(self.device_id, prefix, operation, src, dst, size)
+        self._transfers.add(worker)
+        worker.progress.connect(self.update_progress, Qt.ConnectionType.QueuedConnection)
+        # Bind the worker into the slot; sender() is unreliable once the wrapper is replaced
+        worker.finished.connect(lambda success, message: self.on_transfer_finished(worker, success, message),
+                                Qt.ConnectionType.QueuedConnection)
+        worker.start()
 
     def update_progress(self, percent, status):
         self.progress_bar.setValue(percent)
         self.progress_label.setText(status)
 
-    def on_transfer_finished(self, success, message):
-        self.push_button.setEnabled(True)
-        self.pull_button.setEnabled(True)
+    def on_transfer_finished(self, worker, success, message):
+        self._transfers.discard(worker)
+        if success and worker.operation == 'push':
+            self.invalidate_listing(posixpath.dirname(worker.dst))
+        # Only re-enable transfers once every queued transfer has finished
+        self.push_button.setEnabled(not self._transfers)
+        self.pull_button.setEnabled(not self._transfers)
         self.progress_bar.setValue(100 if success else 0)
         self.progress_label.setText(message)
         if success:
-            self.refresh_file_list()
+            self._refresh_timer.start()
+
+    def closeEvent(self, event):
+        self.stop_device_tracking()
+        self.adb_worker.stop()
+        self.adb_pool.close()
+        super().closeEvent(event)
 
 if __name__ == "__main__":
     app = QApplication(sys.argv)